@@ -3,6 +3,7 @@ from fastapi import Request
 from backend.connection_manager import ConnectionManager
 from backend.groq_chat_client import GroqChatClient
 from backend.mcp_client import MCPClient
+from backend.snapshot_cache import SnapshotCache
 
 
 def get_mcp_client(request: Request) -> MCPClient:
@@ -15,3 +16,7 @@ def get_groq_client(request: Request) -> GroqChatClient:
 
 def get_connection_manager(request: Request) -> ConnectionManager:
     return request.app.state.connection_manager
+
+
+def get_snapshot_cache(request: Request) -> SnapshotCache:
+    return request.app.state.snapshot_cache
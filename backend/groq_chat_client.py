@@ -82,6 +82,7 @@ class GroqChatClient:
                 }
             )
 
+            calls = []
             for tool_call in message.tool_calls:
                 function_name = tool_call.function.name
                 try:
@@ -90,11 +91,12 @@ class GroqChatClient:
                     function_args = {}
 
                 print(f"Calling tool: {function_name}")
+                calls.append((function_name, function_args))
 
-                tool_result = await self.mcp_client.call_tool(
-                    function_name, function_args
-                )
+            # All tool calls of one turn go to the MCP server as a single batch
+            tool_results = await self.mcp_client.call_tools(calls)
 
+            for tool_call, tool_result in zip(message.tool_calls, tool_results):
                 self.conversation_history.append(
                     {
                         "role": "tool",
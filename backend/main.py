@@ -13,6 +13,7 @@ from backend.connection_manager import ConnectionManager
 from backend.groq_chat_client import GroqChatClient
 from backend.mcp_client import MCPClient
 from backend.routes.api import router as api_router
+from backend.snapshot_cache import SAMPLE_INTERVAL_SECONDS, SnapshotCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,6 +28,7 @@ async def lifespan(app: FastAPI):
         api_key="",
     )
     app.state.connection_manager = ConnectionManager()
+    app.state.snapshot_cache = SnapshotCache()
     logger.info("Starting System Monitor API...")
 
     success = await app.state.mcp_client.start()
@@ -39,6 +41,9 @@ async def lifespan(app: FastAPI):
     try:
         yield
     finally:
+        app.state.broadcast_task.cancel()
+        # Let the subscription unsubscribe before the MCP server goes away
+        await asyncio.gather(app.state.broadcast_task, return_exceptions=True)
         await app.state.mcp_client.close()
         logger.info("Shutting down System Monitor API...")
 
@@ -61,29 +66,32 @@ app.mount("/static", StaticFiles(directory="frontend/build/static"), name="stati
 
 
 async def broadcast_system_data():
-    """Periodically broadcast system data to all connected clients"""
+    """Broadcast system data streamed by the MCP server to all connected clients"""
     while True:
         try:
-            if (
-                app.state.mcp_client.is_connected
-                and app.state.connection_manager.active_connections
-            ):
-                system_data = await app.state.mcp_client.get_system_info()
-                await app.state.connection_manager.broadcast(
-                    {
-                        "type": "system_data",
-                        "data": system_data,
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
+            if app.state.mcp_client.is_connected:
+                app.state.snapshot_cache.start_streaming()
+                try:
+                    async for system_data in app.state.mcp_client.subscribe(
+                        SAMPLE_INTERVAL_SECONDS
+                    ):
+                        snapshot = app.state.snapshot_cache.publish(system_data)
+                        if app.state.connection_manager.active_connections:
+                            await app.state.connection_manager.broadcast(
+                                {
+                                    "type": "system_data",
+                                    "data": snapshot.data,
+                                    "timestamp": snapshot.timestamp.isoformat(),
+                                }
+                            )
+                finally:
+                    app.state.snapshot_cache.stop_streaming()
+                logger.error("MCP system data subscription ended")
             else:
                 logger.error(
                     f"MCP Client connection: {app.state.mcp_client.is_connected}"
                 )
-                logger.error(
-                    f"Connection manager connections: {app.state.connection_manager.active_connections}"
-                )
-            await asyncio.sleep(5)
+            await asyncio.sleep(10)
         except Exception as e:
             logger.error(f"Error in broadcast task: {e}")
             await asyncio.sleep(10)
@@ -96,13 +104,13 @@ async def websocket_endpoint(websocket: WebSocket):
     try:
         if app.state.mcp_client.is_connected:
             try:
-                system_data = await app.state.mcp_client.get_system_info()
+                snapshot = await app.state.snapshot_cache.get(app.state.mcp_client)
                 await websocket.send_text(
                     json.dumps(
                         {
                             "type": "system_data",
-                            "data": system_data,
-                            "timestamp": datetime.now().isoformat(),
+                            "data": snapshot.data,
+                            "timestamp": snapshot.timestamp.isoformat(),
                         }
                     )
                 )
@@ -2,7 +2,7 @@ import asyncio
 import json
 import logging
 import sys
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -16,6 +16,11 @@ class MCPClient:
         self.process = None
         self.available_tools = []
         self.is_connected = False
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._pending_subscriptions: Dict[int, asyncio.Queue] = {}
+        self._subscriptions: Dict[int, asyncio.Queue] = {}
+        self._reader_task = None
 
     async def start(self):
         """Start MCP server process"""
@@ -26,8 +31,10 @@ class MCPClient:
                 stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
+                limit=2**20,
             )
             logger.info("MCP Server started")
+            self._reader_task = asyncio.create_task(self._read_messages())
             await self._initialize()
             await self._load_tools()
             self.is_connected = True
@@ -38,32 +45,89 @@ class MCPClient:
             self.is_connected = False
             return False
 
-    async def _send_message(self, message: Dict) -> Dict:
-        """Send message to MCP server"""
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    async def _read_messages(self):
+        """Dispatch responses and notifications coming from the MCP server"""
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line.decode().strip())
+                except json.JSONDecodeError:
+                    continue
+
+                for item in message if isinstance(message, list) else [message]:
+                    # Skip stray output the same way as undecodable lines
+                    if isinstance(item, dict):
+                        self._dispatch(item)
+        except Exception as e:
+            logger.error(f"MCP reader error: {e}")
+        finally:
+            self.is_connected = False
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(Exception("MCP server closed the connection"))
+            self._pending.clear()
+            for queue in self._subscriptions.values():
+                queue.put_nowait(None)
+
+    def _dispatch(self, message: Dict):
+        if message.get("method") == "notifications/system_info":
+            params = message.get("params", {})
+            queue = self._subscriptions.get(params.get("subscription"))
+            if queue:
+                queue.put_nowait(params.get("data"))
+            return
+
+        future = self._pending.pop(message.get("id"), None)
+        if future is None or future.done():
+            return
+        # Register the subscription before its first notification is read
+        queue = self._pending_subscriptions.pop(message.get("id"), None)
+        if queue and "result" in message:
+            self._subscriptions[message["result"]["subscription"]] = queue
+        future.set_result(message)
+
+    async def _send_batch(self, messages: List[Dict]) -> List[Dict]:
+        """Send several requests in one write and wait for all responses"""
         if not self.process:
             raise Exception("MCP server not started")
 
+        futures = []
+        for message in messages:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[message["id"]] = future
+            futures.append(future)
+
         try:
-            message_str = json.dumps(message) + "\n"
-            self.process.stdin.write(message_str.encode())
+            payload = messages[0] if len(messages) == 1 else messages
+            self.process.stdin.write((json.dumps(payload) + "\n").encode())
             await self.process.stdin.drain()
 
-            response_line = await asyncio.wait_for(
-                self.process.stdout.readline(), timeout=10
-            )
-
-            response = json.loads(response_line.decode().strip())
-            return response
+            return await asyncio.wait_for(asyncio.gather(*futures), timeout=10)
 
         except Exception as e:
+            for message in messages:
+                self._pending.pop(message["id"], None)
+                self._pending_subscriptions.pop(message["id"], None)
             logger.error(f"MCP communication error: {e}")
             raise Exception(f"MCP communication failed: {e}")
 
+    async def _send_message(self, message: Dict) -> Dict:
+        """Send message to MCP server"""
+        responses = await self._send_batch([message])
+        return responses[0]
+
     async def _initialize(self):
         """Initialize MCP connection"""
         init_message = {
             "jsonrpc": "2.0",
-            "id": 1,
+            "id": self._new_id(),
             "method": "initialize",
             "params": {
                 "protocolVersion": "2024-11-05",
@@ -79,7 +143,12 @@ class MCPClient:
 
     async def _load_tools(self):
         """Load available tools"""
-        list_message = {"jsonrpc": "2.0", "id": 2, "method": "tools/list", "params": {}}
+        list_message = {
+            "jsonrpc": "2.0",
+            "id": self._new_id(),
+            "method": "tools/list",
+            "params": {},
+        }
 
         response = await self._send_message(list_message)
         if "result" in response:
@@ -92,7 +161,7 @@ class MCPClient:
         """Get system information from MCP server"""
         call_message = {
             "jsonrpc": "2.0",
-            "id": 3,
+            "id": self._new_id(),
             "method": "tools/call",
             "params": {"name": "get_system_info", "arguments": {}},
         }
@@ -113,7 +182,7 @@ class MCPClient:
 
         call_message = {
             "jsonrpc": "2.0",
-            "id": 3,
+            "id": self._new_id(),
             "method": "tools/call",
             "params": {"name": tool_name, "arguments": arguments},
         }
@@ -125,6 +194,68 @@ class MCPClient:
         else:
             return f"Error calling tool {tool_name}: {response.get('error', 'Unknown error')}"
 
+    async def call_tools(self, calls: List[Tuple[str, Dict]]) -> List[str]:
+        """Call several MCP tools with a single JSON-RPC batch"""
+        messages = [
+            {
+                "jsonrpc": "2.0",
+                "id": self._new_id(),
+                "method": "tools/call",
+                "params": {"name": tool_name, "arguments": arguments or {}},
+            }
+            for tool_name, arguments in calls
+        ]
+
+        results = []
+        for (tool_name, _), response in zip(calls, await self._send_batch(messages)):
+            if "result" in response:
+                results.append(response["result"]["content"][0]["text"])
+            else:
+                results.append(
+                    f"Error calling tool {tool_name}: {response.get('error', 'Unknown error')}"
+                )
+        return results
+
+    async def subscribe(
+        self, interval: float, arguments: Optional[Dict] = None
+    ) -> AsyncIterator[Dict]:
+        """Yield system information streamed by the MCP server every interval"""
+        message = {
+            "jsonrpc": "2.0",
+            "id": self._new_id(),
+            "method": "subscribe",
+            "params": {"interval": interval, "arguments": arguments or {}},
+        }
+        queue = asyncio.Queue()
+        self._pending_subscriptions[message["id"]] = queue
+
+        response = await self._send_message(message)
+        if "result" not in response:
+            raise Exception(
+                f"Failed to subscribe: {response.get('error', 'Unknown error')}"
+            )
+        subscription_id = response["result"]["subscription"]
+
+        try:
+            while True:
+                system_data = await queue.get()
+                if system_data is None:
+                    break
+                yield system_data
+        finally:
+            self._subscriptions.pop(subscription_id, None)
+            if self.is_connected:
+                unsubscribe_message = {
+                    "jsonrpc": "2.0",
+                    "id": self._new_id(),
+                    "method": "unsubscribe",
+                    "params": {"subscription": subscription_id},
+                }
+                try:
+                    await self._send_message(unsubscribe_message)
+                except Exception as e:
+                    logger.error(f"Failed to unsubscribe: {e}")
+
     def get_tools_for_groq(self) -> List[Dict]:
         """Convert MCP tools to Groq function calling format"""
         groq_tools = []
@@ -146,6 +277,9 @@ class MCPClient:
     async def close(self):
         """Close MCP server"""
         if self.process:
+            # Mark disconnected first so subscriptions skip unsubscribing
+            self.is_connected = False
             self.process.terminate()
             await self.process.wait()
-            self.is_connected = False
+        if self._reader_task:
+            await self._reader_task
@@ -1,8 +1,9 @@
 import logging
 from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, Response
 
 from backend.chat_message import ChatMessage
 from backend.connection_manager import ConnectionManager
@@ -10,9 +11,11 @@ from backend.deps.dependencies import (
     get_connection_manager,
     get_groq_client,
     get_mcp_client,
+    get_snapshot_cache,
 )
 from backend.groq_chat_client import GroqChatClient
 from backend.mcp_client import MCPClient
+from backend.snapshot_cache import SnapshotCache, negotiate_encoding
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -42,22 +45,53 @@ async def health_check(
 
 
 @router.get("/api/system-info")
-async def get_system_info(mcp_client: MCPClient = Depends(get_mcp_client)):
-    """Get current system information"""
+async def get_system_info(
+    request: Request,
+    wait_for_newer: Optional[int] = None,
+    mcp_client: MCPClient = Depends(get_mcp_client),
+    cache: SnapshotCache = Depends(get_snapshot_cache),
+):
+    """Get current system information
+
+    Responses carry an ETag tied to the snapshot sequence number and answer
+    conditional requests with 304. Pass ``wait_for_newer=<seq>`` to long-poll
+    until a snapshot newer than ``seq`` is available.
+    """
     try:
         if not mcp_client.is_connected:
             raise HTTPException(status_code=503, detail="MCP server not connected")
 
-        system_data = await mcp_client.get_system_info()
-        return {
-            "success": True,
-            "data": system_data,
-            "timestamp": datetime.now().isoformat(),
-        }
+        if wait_for_newer is not None:
+            snapshot = await cache.wait_for_newer(mcp_client, wait_for_newer)
+        else:
+            snapshot = await cache.get(mcp_client)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting system info: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    headers = {
+        "ETag": snapshot.etag(encoding),
+        "Last-Modified": snapshot.last_modified,
+        "Cache-Control": f"max-age={snapshot.max_age()}",
+        "Vary": "Accept-Encoding",
+    }
+    if snapshot.not_modified(
+        request.headers.get("if-none-match", ""),
+        request.headers.get("if-modified-since", ""),
+    ):
+        return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(
+        content=snapshot.encoded_body(encoding),
+        media_type="application/json",
+        headers=headers,
+    )
+
 
 @router.post("/api/chat")
 async def chat_endpoint(
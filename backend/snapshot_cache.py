@@ -0,0 +1,224 @@
+import asyncio
+import gzip
+import json
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+from backend.mcp_client import MCPClient
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL_SECONDS = 5
+LONG_POLL_TIMEOUT_SECONDS = 30
+# How late a streamed sample may be before readers fetch one themselves
+STREAM_GRACE_SECONDS = 2
+
+
+class SystemSnapshot:
+    """A single system info sample with its serialized and compressed bodies"""
+
+    def __init__(
+        self,
+        seq: int,
+        epoch: str,
+        data: Dict,
+        previous: Optional["SystemSnapshot"] = None,
+    ):
+        self.seq = seq
+        self.data = data
+        self.created_at = time.monotonic()
+        self.timestamp = datetime.now()
+        self.last_modified = format_datetime(
+            datetime.now(timezone.utc).replace(microsecond=0), usegmt=True
+        )
+        self._etag_base = f"{epoch}-{seq}"
+        # Last-Modified only has second precision, so it can only validate a
+        # snapshot published in a later second than the one before it
+        self.second_precise = (
+            previous is None or self.last_modified != previous.last_modified
+        )
+        self.body = json.dumps(
+            {
+                "success": True,
+                "seq": seq,
+                "data": data,
+                "timestamp": self.timestamp.isoformat(),
+            }
+        ).encode()
+        self._encoded: Dict[str, bytes] = {}
+
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    def max_age(self) -> int:
+        """Seconds left until the next sample is due"""
+        return max(0, math.ceil(SAMPLE_INTERVAL_SECONDS - self.age()))
+
+    def etag(self, encoding: Optional[str]) -> str:
+        """Strong ETag for one content coding, which must differ per coding"""
+        if encoding is None:
+            return f'"{self._etag_base}"'
+        return f'"{self._etag_base}-{encoding}"'
+
+    def encoded_body(self, encoding: Optional[str]) -> bytes:
+        """Return the body for the given content coding, compressing it once"""
+        if encoding is None:
+            return self.body
+        if encoding not in self._encoded:
+            if encoding == "br":
+                self._encoded[encoding] = brotli.compress(self.body)
+            else:
+                self._encoded[encoding] = gzip.compress(self.body)
+        return self._encoded[encoding]
+
+    def not_modified(self, if_none_match: str, if_modified_since: str) -> bool:
+        """Evaluate conditional request headers against this snapshot"""
+        if if_none_match:
+            # Any coding of this snapshot validates, since they share content
+            etags = {self.etag(None), self.etag("gzip"), self.etag("br")}
+            for tag in if_none_match.split(","):
+                tag = tag.strip()
+                if tag.startswith("W/"):
+                    tag = tag[2:]
+                if tag == "*" or tag in etags:
+                    return True
+            return False
+        if if_modified_since and self.second_precise:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return parsedate_to_datetime(self.last_modified) <= since
+        return False
+
+
+class SnapshotCache:
+    """Shares the latest system info sample between REST and WebSocket clients"""
+
+    def __init__(self):
+        self.current: Optional[SystemSnapshot] = None
+        self._seq = 0
+        self._epoch = format(int(time.time()), "x")
+        self._refresh_lock = asyncio.Lock()
+        self._updated = asyncio.Event()
+        self.streaming = False
+
+    def start_streaming(self):
+        """Mark the cache as fed by an MCP subscription"""
+        self.streaming = True
+
+    def stop_streaming(self):
+        """Fall back to fetching on demand and wake up waiting readers"""
+        self.streaming = False
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    def publish(self, data: Dict) -> SystemSnapshot:
+        """Store a new sample and wake up long-polling clients"""
+        self._seq += 1
+        self.current = SystemSnapshot(self._seq, self._epoch, data, self.current)
+        self._updated.set()
+        self._updated = asyncio.Event()
+        return self.current
+
+    def is_fresh(self) -> bool:
+        return (
+            self.current is not None
+            and self.current.age() < SAMPLE_INTERVAL_SECONDS
+        )
+
+    async def get(self, mcp_client: MCPClient) -> SystemSnapshot:
+        """Return the current sample, fetching a new one if it is stale
+
+        While a subscription feeds the cache, wait for its next sample and
+        only fetch if it is more than STREAM_GRACE_SECONDS late.
+        """
+        if self.is_fresh():
+            return self.current
+
+        if self.streaming:
+            overdue = 0
+            if self.current is not None:
+                overdue = self.current.age() - SAMPLE_INTERVAL_SECONDS
+            try:
+                await asyncio.wait_for(
+                    self._updated.wait(),
+                    timeout=max(STREAM_GRACE_SECONDS - overdue, 0),
+                )
+            except asyncio.TimeoutError:
+                pass
+            if self.is_fresh():
+                return self.current
+
+        async with self._refresh_lock:
+            # Another request may have refreshed while we were waiting
+            if self.is_fresh():
+                return self.current
+            system_data = await mcp_client.get_system_info()
+            return self.publish(system_data)
+
+    async def wait_for_newer(
+        self,
+        mcp_client: MCPClient,
+        seq: int,
+        timeout: float = LONG_POLL_TIMEOUT_SECONDS,
+    ) -> SystemSnapshot:
+        """Return the first sample newer than seq, or the current one on timeout
+
+        A seq ahead of the current sequence comes from before a restart, so
+        the current sample is returned right away.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = await self.get(mcp_client)
+            remaining = deadline - time.monotonic()
+            if snapshot.seq != seq or remaining <= 0:
+                return snapshot
+
+            wait = remaining
+            if not self.streaming:
+                wait = min(remaining, SAMPLE_INTERVAL_SECONDS - snapshot.age())
+            try:
+                await asyncio.wait_for(self._updated.wait(), timeout=max(wait, 0))
+            except asyncio.TimeoutError:
+                pass
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred supported content coding from Accept-Encoding"""
+    weights = {}
+    for item in accept_encoding.split(","):
+        parts = item.strip().split(";")
+        coding = parts[0].strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[coding] = quality
+
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    candidates = [
+        coding
+        for coding in supported
+        if weights.get(coding, weights.get("*", 0.0)) > 0
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda coding: weights.get(coding, weights.get("*")))
@@ -0,0 +1,274 @@
+import os
+import time
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+PRESSURE_RESOURCES = ("cpu", "memory", "io")
+READ_SIZE = 16384
+# Same window psutil.cpu_percent uses for the host view, only waited for on
+# the first sample since later ones measure since the previous sample
+FIRST_SAMPLE_INTERVAL = 0.1
+
+# cgroup v1 controllers may be mounted on their own or co-mounted
+V1_MOUNTS = {
+    "cpu": ("cpu", "cpu,cpuacct", "cpuacct,cpu"),
+    "cpuacct": ("cpuacct", "cpu,cpuacct", "cpuacct,cpu"),
+    "memory": ("memory",),
+}
+# cgroup v2 has one hierarchy shared by all controllers
+V2_CONTROLLER = "unified"
+
+
+def cgroup_version():
+    return 2 if os.path.exists(os.path.join(CGROUP_ROOT, "cgroup.controllers")) else 1
+
+
+def _own_cgroup_paths(version):
+    """Map each controller to this process's cgroup path from /proc/self/cgroup"""
+    paths = {}
+    with open("/proc/self/cgroup") as f:
+        for line in f:
+            _, controllers, path = line.rstrip("\n").split(":", 2)
+            if version == 2 and controllers == "":
+                paths[V2_CONTROLLER] = path
+            elif version == 1:
+                for controller in controllers.split(","):
+                    if controller in V1_MOUNTS:
+                        paths[controller] = path
+    return paths
+
+
+def _v1_mount(controller):
+    for name in V1_MOUNTS[controller]:
+        mount = os.path.join(CGROUP_ROOT, name)
+        if os.path.isdir(mount):
+            return mount
+    return os.path.join(CGROUP_ROOT, controller)
+
+
+def resolve_cgroup(cgroup=None):
+    """Map each controller to its directory for a cgroup path
+
+    Without a path this process's own cgroup is used, per controller.
+    """
+    version = cgroup_version()
+    controllers = (V2_CONTROLLER,) if version == 2 else tuple(V1_MOUNTS)
+    if cgroup is None:
+        own_paths = _own_cgroup_paths(version)
+        paths = {controller: own_paths.get(controller, "/") for controller in controllers}
+    else:
+        paths = {controller: cgroup for controller in controllers}
+
+    directories = {}
+    for controller, path in paths.items():
+        mount = CGROUP_ROOT if version == 2 else _v1_mount(controller)
+        directory = os.path.normpath(os.path.join(mount, path.lstrip("/")))
+        if os.path.commonpath([mount, directory]) != mount:
+            raise ValueError(f"Invalid cgroup path: {path}")
+        if not os.path.isdir(directory):
+            if cgroup is not None:
+                raise ValueError(f"cgroup not found: {cgroup}")
+            # Without a cgroup namespace the container only sees its own
+            # subtree mounted at the root, so fall back to it
+            directory = mount
+        directories[controller] = directory
+    return directories
+
+
+class CgroupCollector:
+    """Reads CPU, memory and pressure stats for one cgroup
+
+    Every stat file is opened once and re-read with ``os.pread`` on each
+    sample, so sampling does not pay for path lookups or psutil parsing.
+    A failed read raises ``OSError``, e.g. once the cgroup has been removed.
+    """
+
+    def __init__(self, cgroup=None, directories=None):
+        self.version = cgroup_version()
+        self.directories = directories or resolve_cgroup(cgroup)
+        if cgroup is None:
+            own_paths = _own_cgroup_paths(self.version)
+            cgroup = own_paths.get(V2_CONTROLLER if self.version == 2 else "memory", "/")
+        self.path = cgroup
+        self._fds = {}
+        self._pressure_scopes = {}
+        self._host_cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+        self._host_memory = self._read_host_memory()
+
+        if self.version == 2:
+            directory = self.directories[V2_CONTROLLER]
+            self._open("cpu.max", directory, "cpu.max")
+            self._open("cpu.stat", directory, "cpu.stat")
+            self._open("memory.current", directory, "memory.current")
+            self._open("memory.max", directory, "memory.max")
+            self._open("memory.stat", directory, "memory.stat")
+        else:
+            cpu_dir = self.directories["cpu"]
+            cpuacct_dir = self.directories["cpuacct"]
+            memory_dir = self.directories["memory"]
+            self._open("cpu.cfs_quota_us", cpu_dir, "cpu.cfs_quota_us")
+            self._open("cpu.cfs_period_us", cpu_dir, "cpu.cfs_period_us")
+            self._open("cpuacct.usage", cpuacct_dir, "cpuacct.usage")
+            self._open("memory.usage_in_bytes", memory_dir, "memory.usage_in_bytes")
+            self._open("memory.limit_in_bytes", memory_dir, "memory.limit_in_bytes")
+            self._open("memory.stat", memory_dir, "memory.stat")
+
+        # v1 has no per-cgroup PSI, and v2 may not expose it, in which case
+        # the system-wide /proc/pressure values are reported as host scope
+        for resource in PRESSURE_RESOURCES:
+            name = f"{resource}.pressure"
+            if self.version == 2 and self._open(name, self.directories[V2_CONTROLLER], name):
+                self._pressure_scopes[resource] = "cgroup"
+            elif self._open(name, "/proc/pressure", resource):
+                self._pressure_scopes[resource] = "host"
+
+        if "cpu.stat" not in self._fds and "cpuacct.usage" not in self._fds:
+            self.close()
+            raise RuntimeError(f"No cgroup CPU accounting found for {self.path}")
+
+        self._last_usage = self._cpu_usage_ns()
+        self._last_time = time.monotonic_ns()
+        self._first_sample = True
+
+    def _open(self, name, directory, filename):
+        try:
+            self._fds[name] = os.open(os.path.join(directory, filename), os.O_RDONLY)
+            return True
+        except OSError:
+            return False
+
+    def _read(self, name):
+        fd = self._fds.get(name)
+        if fd is None:
+            return None
+        return os.pread(fd, READ_SIZE, 0).decode()
+
+    def _read_int(self, name):
+        value = self._read(name)
+        if value is None:
+            return None
+        value = value.strip()
+        if value == "max":
+            return None
+        return int(value)
+
+    def _read_keyed(self, name):
+        value = self._read(name)
+        if value is None:
+            return {}
+        stats = {}
+        for line in value.splitlines():
+            key, _, number = line.partition(" ")
+            if number:
+                stats[key] = int(number)
+        return stats
+
+    def _read_host_memory(self):
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) * 1024
+        return None
+
+    def _cpu_usage_ns(self):
+        if self.version == 2:
+            return self._read_keyed("cpu.stat").get("usage_usec", 0) * 1000
+        return self._read_int("cpuacct.usage") or 0
+
+    def _cpu_limit(self):
+        """Effective number of CPUs allowed by the CFS quota"""
+        if self.version == 2:
+            value = self._read("cpu.max")
+            if not value:
+                return None
+            quota, period = value.split()[:2]
+            if quota == "max":
+                return None
+            return int(quota) / int(period)
+        quota = self._read_int("cpu.cfs_quota_us")
+        period = self._read_int("cpu.cfs_period_us")
+        if quota is None or quota <= 0 or not period:
+            return None
+        return quota / period
+
+    def _memory(self):
+        if self.version == 2:
+            usage = self._read_int("memory.current")
+            limit = self._read_int("memory.max")
+            inactive_file = self._read_keyed("memory.stat").get("inactive_file", 0)
+        else:
+            usage = self._read_int("memory.usage_in_bytes")
+            limit = self._read_int("memory.limit_in_bytes")
+            inactive_file = self._read_keyed("memory.stat").get("total_inactive_file", 0)
+        # v1 reports an unlimited cgroup as a huge page-aligned number
+        if limit is not None and self._host_memory and limit >= self._host_memory:
+            limit = None
+        return max((usage or 0) - inactive_file, 0), limit
+
+    def _pressure(self):
+        pressure = {}
+        for resource in PRESSURE_RESOURCES:
+            value = self._read(f"{resource}.pressure")
+            if value is None:
+                continue
+            pressure[resource] = {}
+            for line in value.splitlines():
+                kind, *fields = line.split()
+                pressure[resource][kind] = {
+                    key: float(number)
+                    for key, number in (field.split("=") for field in fields)
+                    if key != "total"
+                }
+        return pressure
+
+    def sample(self, pressure=True):
+        """Take one sample of the cgroup's CPU, memory and (optionally) pressure stats"""
+        if self._first_sample:
+            self._first_sample = False
+            since_created = (time.monotonic_ns() - self._last_time) / 1e9
+            if since_created < FIRST_SAMPLE_INTERVAL:
+                time.sleep(FIRST_SAMPLE_INTERVAL - since_created)
+
+        usage = self._cpu_usage_ns()
+        now = time.monotonic_ns()
+        elapsed = now - self._last_time
+        cpu_limit = self._cpu_limit()
+        cores = min(cpu_limit, self._host_cpus) if cpu_limit else self._host_cpus
+        usage_percent = 0.0
+        if elapsed > 0:
+            usage_percent = (usage - self._last_usage) / (elapsed * cores) * 100
+        self._last_usage = usage
+        self._last_time = now
+
+        memory_used, memory_limit = self._memory()
+        memory_total = memory_limit or self._host_memory
+
+        info = {
+            "cpu": {
+                "cores": round(cores, 2),
+                "usage_percent": round(min(usage_percent, 100.0), 1),
+            },
+            "memory": {
+                "total_gb": round(memory_total / (1024**3), 2),
+                "used_gb": round(memory_used / (1024**3), 2),
+                "available_gb": round(max(memory_total - memory_used, 0) / (1024**3), 2),
+                "usage_percent": round(memory_used / memory_total * 100, 1),
+            },
+            "cgroup": {
+                "version": self.version,
+                "path": self.path,
+                "cpu_limit_cores": round(cpu_limit, 2) if cpu_limit else None,
+                "memory_limit_gb": round(memory_limit / (1024**3), 2) if memory_limit else None,
+            },
+        }
+        if pressure:
+            info["cgroup"]["pressure"] = self._pressure()
+            info["cgroup"]["pressure_scope"] = dict(self._pressure_scopes)
+        return info
+
+    def close(self):
+        for fd in self._fds.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fds = {}
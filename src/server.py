@@ -1,17 +1,98 @@
 import asyncio
+import itertools
 import json
 import sys
+import threading
 import psutil
 import platform
+import timeit
+from collections import OrderedDict
 from datetime import datetime
 
-def get_system_info():
+from cgroup_collector import CgroupCollector, resolve_cgroup
+
+MAX_CGROUP_COLLECTORS = 16
+MAX_CGROUP_ARGUMENTS = 64
+SCOPES = ("host", "container")
+
+# Collectors keyed by their resolved directories, least recently used first
+_cgroup_collectors = OrderedDict()
+# Resolved directories per cgroup argument, so samples skip the lookup
+_cgroup_directories = OrderedDict()
+# Samples are taken in worker threads, off the JSON-RPC event loop
+_cgroup_collectors_lock = threading.Lock()
+
+def sample_cgroup(cgroup=None, pressure=True):
+    """Sample a cgroup, keeping its collector's file handles open between samples"""
+    with _cgroup_collectors_lock:
+        return _sample_cgroup(cgroup, pressure)
+
+def _resolve_cgroup(cgroup):
+    directories = resolve_cgroup(cgroup)
+    _cgroup_directories[cgroup] = directories
+    _cgroup_directories.move_to_end(cgroup)
+    while len(_cgroup_directories) > MAX_CGROUP_ARGUMENTS:
+        _cgroup_directories.popitem(last=False)
+    return directories
+
+def _sample_cgroup(cgroup, pressure):
+    directories = _cgroup_directories.get(cgroup)
+    if directories is None:
+        directories = _resolve_cgroup(cgroup)
+    key = tuple(sorted(directories.items()))
+    
+    collector = _cgroup_collectors.pop(key, None)
+    if collector is not None:
+        try:
+            container = collector.sample(pressure)
+        except OSError:
+            # The cgroup's files went away (e.g. it was removed and
+            # recreated), so resolve and reopen them instead of reporting
+            # stale zeros
+            collector.close()
+            collector = None
+            directories = _resolve_cgroup(cgroup)
+            key = tuple(sorted(directories.items()))
+            collector = _cgroup_collectors.pop(key, None)
+            if collector is not None:
+                collector.close()
+                collector = None
+    if collector is None:
+        collector = CgroupCollector(cgroup, directories)
+        container = collector.sample(pressure)
+    
+    _cgroup_collectors[key] = collector
+    while len(_cgroup_collectors) > MAX_CGROUP_COLLECTORS:
+        _, evicted = _cgroup_collectors.popitem(last=False)
+        evicted.close()
+    return container
+
+def get_system_info(scope="host", cgroup=None):
     """Get all system information"""
     try:
-        cpu_percent = psutil.cpu_percent(interval=0.1, percpu=True)
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown scope: {scope}")
+        
         cpu_freq = psutil.cpu_freq()
         
-        memory = psutil.virtual_memory()
+        if scope == "container":
+            container = sample_cgroup(cgroup)
+            cpu = container["cpu"]
+            memory = container["memory"]
+        else:
+            cpu_percent = psutil.cpu_percent(interval=0.1, percpu=True)
+            cpu = {
+                "cores": psutil.cpu_count(),
+                "usage_percent": round(sum(cpu_percent) / len(cpu_percent), 1)
+            }
+            virtual_memory = psutil.virtual_memory()
+            memory = {
+                "total_gb": round(virtual_memory.total / (1024**3), 2),
+                "used_gb": round(virtual_memory.used / (1024**3), 2),
+                "available_gb": round(virtual_memory.available / (1024**3), 2),
+                "usage_percent": virtual_memory.percent
+            }
+        cpu["frequency_mhz"] = cpu_freq.current if cpu_freq else "N/A"
         
         partitions = psutil.disk_partitions()
         disks = []
@@ -31,7 +112,7 @@ def get_system_info():
         boot_time = datetime.fromtimestamp(psutil.boot_time())
         uptime = datetime.now() - boot_time
         
-        return {
+        info = {
             "system": {
                 "platform": platform.system(),
                 "release": platform.release(),
@@ -39,114 +120,300 @@ def get_system_info():
                 "processor": platform.processor()
             },
             "uptime_hours": round(uptime.total_seconds() / 3600, 1),
-            "cpu": {
-                "cores": psutil.cpu_count(),
-                "usage_percent": round(sum(cpu_percent) / len(cpu_percent), 1),
-                "frequency_mhz": cpu_freq.current if cpu_freq else "N/A"
-            },
-            "memory": {
-                "total_gb": round(memory.total / (1024**3), 2),
-                "used_gb": round(memory.used / (1024**3), 2),
-                "available_gb": round(memory.available / (1024**3), 2),
-                "usage_percent": memory.percent
-            },
+            "cpu": cpu,
+            "memory": memory,
             "disks": disks,
             "timestamp": datetime.now().isoformat()
         }
+        if scope == "container":
+            info["cgroup"] = container["cgroup"]
+        return info
     except Exception as e:
         return {"error": str(e)}
 
-async def handle_jsonrpc():
-    """Handle JSON-RPC communication"""
-    print("System Info MCP Server started", file=sys.stderr)
+def benchmark_collectors(number=1000):
+    """Compare the per-sample cost of the psutil and cgroup CPU/memory paths
+
+    The cgroup side goes through sample_cgroup() like the container scope
+    of get_system_info, timed with and without the PSI reads that psutil
+    has no equivalent for.
+    """
+    def psutil_sample():
+        psutil.cpu_count()
+        psutil.cpu_percent(interval=None, percpu=True)
+        psutil.virtual_memory()
+    
+    sample_cgroup()
+    psutil.cpu_percent(interval=None, percpu=True)
+    
+    results = {}
+    for name, sample in (
+        ("psutil", psutil_sample),
+        ("cgroup", lambda: sample_cgroup(pressure=False)),
+        ("cgroup_with_pressure", sample_cgroup),
+    ):
+        seconds = timeit.timeit(sample, number=number)
+        results[name] = round(seconds / number * 1e6, 1)
+    return {"samples": number, "microseconds_per_sample": results}
+
+TOOLS = [
+    {
+        "name": "get_system_info",
+        "description": "Get comprehensive system information including CPU, memory, disk usage, and system details. Use scope 'container' for the CPU quota/usage, memory limit/usage and pressure of a cgroup instead of host-wide values",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "scope": {
+                    "type": "string",
+                    "enum": ["host", "container"],
+                    "description": "Report host-wide values or values for a cgroup"
+                },
+                "cgroup": {
+                    "type": "string",
+                    "description": "cgroup path relative to /sys/fs/cgroup for the container scope, defaults to this server's own cgroup"
+                }
+            },
+            "required": []
+        }
+    }
+]
+
+DEFAULT_SUBSCRIBE_INTERVAL = 5
+MIN_SUBSCRIBE_INTERVAL = 1
+
+_subscription_ids = itertools.count(1)
+
+def write_message(message):
+    """Write one JSON-RPC message (or batch) as a single line"""
+    print(json.dumps(message), flush=True)
+
+def error_response(message_id, code, text):
+    return {
+        "jsonrpc": "2.0",
+        "id": message_id,
+        "error": {
+            "code": code,
+            "message": text
+        }
+    }
+
+async def stream_snapshots(subscription_id, interval, arguments):
+    """Push get_system_info notifications at a fixed rate until cancelled"""
+    loop = asyncio.get_running_loop()
+    seq = 0
+    next_run = loop.time()
+    while True:
+        seq += 1
+        write_message({
+            "jsonrpc": "2.0",
+            "method": "notifications/system_info",
+            "params": {
+                "subscription": subscription_id,
+                "seq": seq,
+                "data": await asyncio.to_thread(
+                    get_system_info,
+                    scope=arguments.get("scope", "host"),
+                    cgroup=arguments.get("cgroup")
+                )
+            }
+        })
+        next_run += interval
+        await asyncio.sleep(max(next_run - loop.time(), 0))
+
+async def handle_message(message, subscriptions):
+    """Handle a single JSON-RPC request and return its response, if any
+
+    Errors are answered per request, so one bad item in a batch does not
+    keep the other items from being answered.
+    """
+    if not isinstance(message, dict):
+        return error_response(None, -32600, "Invalid Request")
+    
+    try:
+        response = await dispatch_message(message, subscriptions)
+        # Notifications never get a reply, not even an error
+        if response and "error" in response and "id" not in message:
+            return None
+        return response
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        if "id" in message:
+            return error_response(message.get("id"), -32603, f"Internal error: {e}")
+        return None
+
+async def dispatch_message(message, subscriptions):
+    params = message.get("params", {})
+    if not isinstance(params, dict):
+        return error_response(message.get("id"), -32602, "Invalid params: params must be an object")
+    arguments = params.get("arguments", {})
+    if not isinstance(arguments, dict):
+        return error_response(message.get("id"), -32602, "Invalid params: arguments must be an object")
+    
+    response = None
+    
+    if message.get("method") == "initialize":
+        response = {
+            "jsonrpc": "2.0",
+            "id": message.get("id"),
+            "result": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {
+                    "tools": {}
+                },
+                "serverInfo": {
+                    "name": "system-info-server",
+                    "version": "1.0.0"
+                }
+            }
+        }
+        
+    elif message.get("method") == "tools/list":
+        response = {
+            "jsonrpc": "2.0", 
+            "id": message.get("id"),
+            "result": {
+                "tools": TOOLS
+            }
+        }
+        
+    elif message.get("method") == "tools/call":
+        tool_name = params.get("name")
+        
+        if tool_name == "get_system_info":
+            if arguments.get("scope", "host") not in SCOPES:
+                return error_response(message.get("id"), -32602, f"Unknown scope: {arguments.get('scope')}")
+            system_info = await asyncio.to_thread(
+                get_system_info,
+                scope=arguments.get("scope", "host"),
+                cgroup=arguments.get("cgroup")
+            )
+            response = {
+                "jsonrpc": "2.0",
+                "id": message.get("id"),
+                "result": {
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": json.dumps(system_info, indent=2)
+                        }
+                    ]
+                }
+            }
+        else:
+            response = error_response(message.get("id"), -32601, f"Unknown tool: {tool_name}")
+    
+    elif message.get("method") == "subscribe":
+        interval = params.get("interval", DEFAULT_SUBSCRIBE_INTERVAL)
+        if arguments.get("scope", "host") not in SCOPES:
+            return error_response(message.get("id"), -32602, f"Unknown scope: {arguments.get('scope')}")
+        if not isinstance(interval, (int, float)) or interval < MIN_SUBSCRIBE_INTERVAL:
+            return error_response(
+                message.get("id"),
+                -32602,
+                f"Invalid interval: {interval}, must be at least {MIN_SUBSCRIBE_INTERVAL}s"
+            )
+        
+        subscription_id = next(_subscription_ids)
+        subscriptions[subscription_id] = asyncio.create_task(
+            stream_snapshots(subscription_id, interval, arguments)
+        )
+        response = {
+            "jsonrpc": "2.0",
+            "id": message.get("id"),
+            "result": {
+                "subscription": subscription_id
+            }
+        }
     
-    tools = [
-        {
-            "name": "get_system_info",
-            "description": "Get comprehensive system information including CPU, memory, disk usage, and system details",
-            "inputSchema": {
-                "type": "object",
-                "properties": {},
-                "required": []
+    elif message.get("method") == "unsubscribe":
+        task = subscriptions.pop(params.get("subscription"), None)
+        if task:
+            task.cancel()
+        response = {
+            "jsonrpc": "2.0",
+            "id": message.get("id"),
+            "result": {
+                "unsubscribed": task is not None
             }
         }
-    ]
     
-    while True:
+    elif "id" in message:
+        response = error_response(message.get("id"), -32601, f"Method not found: {message.get('method')}")
+    
+    return response
+
+async def handle_line(line, subscriptions):
+    """Handle one line holding a JSON-RPC request or batch"""
+    try:
         try:
-            line = await asyncio.get_event_loop().run_in_executor(None, sys.stdin.readline)
-            if not line:
-                break
-                
             message = json.loads(line.strip())
-            response = None
+        except json.JSONDecodeError:
+            write_message(error_response(None, -32700, "Parse error"))
+            return
+        
+        if isinstance(message, list):
+            # JSON-RPC batch: answer with one array in a single write
+            if not message:
+                response = error_response(None, -32600, "Invalid Request")
+            else:
+                responses = await asyncio.gather(
+                    *(handle_message(item, subscriptions) for item in message)
+                )
+                response = [item for item in responses if item] or None
+        else:
+            response = await handle_message(message, subscriptions)
+        
+        if response:
+            write_message(response)
             
-            if message.get("method") == "initialize":
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": message.get("id"),
-                    "result": {
-                        "protocolVersion": "2024-11-05",
-                        "capabilities": {
-                            "tools": {}
-                        },
-                        "serverInfo": {
-                            "name": "system-info-server",
-                            "version": "1.0.0"
-                        }
-                    }
-                }
-                
-            elif message.get("method") == "tools/list":
-                response = {
-                    "jsonrpc": "2.0", 
-                    "id": message.get("id"),
-                    "result": {
-                        "tools": tools
-                    }
-                }
-                
-            elif message.get("method") == "tools/call":
-                params = message.get("params", {})
-                tool_name = params.get("name")
-                
-                if tool_name == "get_system_info":
-                    system_info = get_system_info()
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": message.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": json.dumps(system_info, indent=2)
-                                }
-                            ]
-                        }
-                    }
-                else:
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": message.get("id"),
-                        "error": {
-                            "code": -32601,
-                            "message": f"Unknown tool: {tool_name}"
-                        }
-                    }
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+
+async def open_stdin_reader():
+    """Wrap stdin in an asyncio stream reader"""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=2**20)
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+    )
+    return reader
+
+async def handle_jsonrpc():
+    """Handle JSON-RPC communication"""
+    print("System Info MCP Server started", file=sys.stderr)
+    
+    reader = await open_stdin_reader()
+    subscriptions = {}
+    pending = set()
+    
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+                continue
+            if not line:
+                break
             
-            if response:
-                print(json.dumps(response), flush=True)
-                
-        except json.JSONDecodeError:
-            continue
-        except Exception as e:
-            print(f"Error: {e}", file=sys.stderr)
-            continue
+            # Handle each line in its own task so a slow tool call does not
+            # hold up the requests behind it
+            task = asyncio.create_task(handle_line(line, subscriptions))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        
+        await asyncio.gather(*pending)
+    finally:
+        for task in subscriptions.values():
+            task.cancel()
 
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "test":
         print("=== SYSTEM INFO TEST ===")
         info = get_system_info()
         print(json.dumps(info, indent=2))
+    elif len(sys.argv) > 1 and sys.argv[1] == "bench":
+        print("=== COLLECTOR BENCHMARK ===")
+        print(json.dumps(benchmark_collectors(), indent=2))
     else:
         asyncio.run(handle_jsonrpc())
\ No newline at end of file